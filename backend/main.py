@@ -2,6 +2,8 @@
 Main entry point for the agentic workflows API.
 """
 
+import os
+
 import dotenv
 import logging
 from langchain_core.globals import set_debug, set_verbose
@@ -19,18 +21,21 @@ if __name__ == "__main__":
     # Load environment variables
     dotenv.load_dotenv()
 
-    # Enable LangChain debugging
-    set_debug(True)
-    set_verbose(True)
+    debug = os.getenv("DEBUG", "false").lower() == "true"
 
-    # TODO add configuration from environment variables?
+    # Enable LangChain debugging only in development, as it logs every run
+    if debug:
+        set_debug(True)
+        set_verbose(True)
 
     import uvicorn
 
+    # Conversation state lives in an in-memory checkpointer, so the server
+    # must run as a single worker process
     uvicorn.run(
         "src.core.api:app",
         host="0.0.0.0",
         port=8000,
-        log_level="debug",
-        reload=True,
+        log_level=os.getenv("LOG_LEVEL", "debug" if debug else "info").lower(),
+        reload=debug,
     )
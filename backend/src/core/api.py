@@ -1,41 +1,65 @@
 """OpenAI-compatible API for Open WebUI integration."""
 # Import logging configuration first to set up file logging
+from . import logging_config  # noqa: F401
 
 import time
-import uuid
-import traceback
+import secrets
 import logging
+from contextlib import aclosing, asynccontextmanager
+
+import orjson
 
 from .state_logger import GREY, RESET
-from typing import AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, Tuple, Union
 
-from fastapi import FastAPI, APIRouter, HTTPException, status, Request
+from fastapi import FastAPI, APIRouter, HTTPException, status, Request, Response
 from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.types import Command
 
-from .models import (
-    ChatCompletionRequest,
-    ModelsResponse,
-    ChatCompletionResponse,
-    ChatCompletionChoice,
-    ChatMessage,
+from .models import ChatCompletionRequest, ModelsResponse
+from .streaming import (
+    create_sse_chunk,
+    create_content_chunk_encoder,
+    create_done_chunk,
+    create_error_chunk,
 )
-from .streaming import create_sse_chunk, create_done_chunk, create_error_chunk
 from ..workflows.registry import WorkflowRegistry
 from ..workflows.utils import create_workflow_initial_state
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # In-memory checkpointer for storing graph state
 checkpointer = InMemorySaver()
 
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    """
+    Compile all workflows at startup so the first request skips graph building,
+    and release pooled LLM connections at shutdown.
+    """
+    for model in WorkflowRegistry.get_available_models():
+        try:
+            WorkflowRegistry.get_workflow(model.id, checkpointer)
+        except ValueError as e:
+            logger.warning(f"Could not prewarm workflow {model.id}: {e}")
+    yield
+
+    try:
+        from .llm_client import client
+    except ValueError:
+        # No API key configured, so no LLM client (or session) was created
+        return
+    await client.aclose()
+
+
 app = FastAPI(
     title="Support Desk IT Support Agent",
     description="OpenAI-compatible API for IT support chatbot training",
     version="0.1.0",
+    lifespan=_lifespan,
 )
 
 # Add CORS middleware for Open WebUI compatibility
@@ -50,22 +74,19 @@ app.add_middleware(
 # Create v1 router
 v1_router = APIRouter(prefix="/v1")
 
-
-def _extract_chat_id_from_headers(request: Request) -> Optional[str]:
-    """Extract chat ID from Open WebUI standard header for thread persistence."""
-    chat_id = request.headers.get("X-OpenWebUI-Chat-Id")
-    if chat_id:
-        logger.info(f"Found chat ID '{chat_id}' in header 'X-OpenWebUI-Chat-Id'")
-        return chat_id
-
-    return None
+# The model list is fixed at import time, so serialise its response once
+_MODELS_RESPONSE_JSON = ModelsResponse(
+    data=WorkflowRegistry.get_available_models()
+).model_dump_json()
 
 
 def _determine_thread_id(req: ChatCompletionRequest, request: Request) -> str:
     """Determine the thread ID for conversation state persistence."""
-    # Priority 1: Chat ID from OpenWebUI headers
-    chat_id = _extract_chat_id_from_headers(request)
+    # Priority 1: Chat ID from Open WebUI standard header (stored lower-cased)
+    chat_id = request.headers.get("x-openwebui-chat-id")
     if chat_id:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Found chat ID '{chat_id}' in header 'X-OpenWebUI-Chat-Id'")
         return f"chat-{chat_id}"
 
     # Priority 2: Explicit thread_id in request body
@@ -73,11 +94,85 @@ def _determine_thread_id(req: ChatCompletionRequest, request: Request) -> str:
         return req.thread_id
 
     # Priority 3: Generate new thread ID (always create unique ID)
-    thread_id = f"thread-{uuid.uuid4().hex}"
+    thread_id = f"thread-{secrets.token_hex(16)}"
     logger.info(f"Generated new thread_id: {thread_id}")
     return thread_id
 
 
+async def _get_thread_values(workflow, config: dict) -> dict:
+    """
+    Get the persisted channel values for a thread, or an empty dict if it is new.
+
+    Reads the latest checkpoint directly from the checkpointer rather than via
+    aget_state, which also rebuilds tasks, interrupts and subgraph state that
+    the thread lookup does not need.
+    """
+    try:
+        checkpoint_tuple = await workflow.checkpointer.aget_tuple(config)
+    except (AttributeError, NotImplementedError):
+        # Checkpointer without async tuple access - fall back to full state
+        existing_state = await workflow.aget_state(config)
+        return existing_state.values
+
+    if checkpoint_tuple is None:
+        return {}
+    return checkpoint_tuple.checkpoint.get("channel_values", {})
+
+
+# Stream keys that carry control data rather than node execution updates
+_NON_NODE_KEYS = frozenset({"custom_llm_chunk", "__interrupt__"})
+
+
+async def _iter_stream(
+    workflow, workflow_input, config: dict
+) -> AsyncGenerator[Tuple[str, Any], None]:
+    """
+    Run a workflow and normalise its stream into ``(kind, payload)`` events.
+
+    Accepts both the ``(stream_type, data)`` tuples produced by multi-mode
+    streaming and bare dictionaries (backwards compatibility).
+
+    Yields:
+        ``("text", str)`` for user-facing LLM output,
+        ``("update", (node_name, node_updates))`` for node execution updates and
+        ``("interrupt", value)`` for the first pending interrupt
+    """
+    stream = workflow.astream(
+        workflow_input, config=config, stream_mode=["custom", "updates"]
+    )
+    try:
+        async for chunk in stream:
+            if isinstance(chunk, tuple) and len(chunk) == 2:
+                stream_type, stream_data = chunk
+            else:
+                stream_type, stream_data = None, chunk
+
+            if not isinstance(stream_data, dict):
+                continue
+
+            get = stream_data.get
+
+            # Handle custom LLM chunks for user-facing streaming
+            if stream_type != "updates":
+                text = get("custom_llm_chunk")
+                if text:
+                    yield "text", text
+
+            # Handle node execution updates for tracking
+            if stream_type != "custom":
+                for node_name, node_updates in stream_data.items():
+                    if node_name not in _NON_NODE_KEYS and node_updates is not None:
+                        yield "update", (node_name, node_updates)
+
+            # Handle LangGraph interrupts - for simplicity, surface the first one
+            interrupts = get("__interrupt__")
+            if interrupts:
+                yield "interrupt", interrupts[0].value
+    finally:
+        # Close explicitly so an early exit (e.g. on interrupt) releases the run
+        await stream.aclose()
+
+
 async def _workflow_stream(
     req: ChatCompletionRequest, workflow, thread_id: str
 ) -> AsyncGenerator[str, None]:
@@ -86,20 +181,23 @@ async def _workflow_stream(
 
     config = {"configurable": {"thread_id": thread_id}}
 
+    # Serialise the request messages once, in a single pydantic-core call, and
+    # reuse them in every branch
+    current_messages = req.model_dump(include={"messages"})["messages"]
+
     # Check if there's existing state for this thread
     try:
-        existing_state = await workflow.aget_state(config)
-        if existing_state.values:
+        existing_values = await _get_thread_values(workflow, config)
+        if existing_values:
             # Check if this is a regenerate scenario (same messages as before)
-            existing_messages = existing_state.values.get("messages", [])
-            current_messages = (
-                [msg.model_dump() for msg in req.messages] if req.messages else []
-            )
+            existing_messages = existing_values.get("messages", [])
 
+            # Compare the tail first so continuations skip the full deep compare
             is_regenerate = (
-                len(existing_messages) == len(current_messages)
+                len(current_messages) > 0
+                and len(existing_messages) == len(current_messages)
+                and existing_messages[-1] == current_messages[-1]
                 and existing_messages == current_messages
-                and len(current_messages) > 0
             )
 
             if is_regenerate:
@@ -107,88 +205,9 @@ async def _workflow_stream(
                 logger.info(
                     f"Detected regenerate for thread {thread_id} - restarting workflow"
                 )
-                state = create_workflow_initial_state(req.model)
+                workflow_input = create_workflow_initial_state(req.model)
                 if req.messages:
-                    state["messages"] = current_messages
-
-                # Start fresh workflow (same as new conversation)
-                async for chunk in workflow.astream(
-                    state, config=config, stream_mode=["custom", "updates"]
-                ):
-                    # Handle both tuple format (stream_type, data) and direct dictionary format
-                    if isinstance(chunk, tuple) and len(chunk) == 2:
-                        stream_type, stream_data = chunk
-                        logger.debug(
-                            f"Stream chunk received: {stream_type} -> {list(stream_data.keys()) if isinstance(stream_data, dict) else type(stream_data)}"
-                        )
-
-                        if stream_type == "custom":
-                            # Handle custom LLM chunks for user-facing streaming
-                            if (
-                                isinstance(stream_data, dict)
-                                and "custom_llm_chunk" in stream_data
-                            ):
-                                text = stream_data.get("custom_llm_chunk")
-                                if text:
-                                    yield text
-
-                        elif stream_type == "updates":
-                            # Handle node execution updates for tracking
-                            if isinstance(stream_data, dict):
-                                for node_name, node_updates in stream_data.items():
-                                    if (
-                                        node_name
-                                        not in ["custom_llm_chunk", "__interrupt__"]
-                                        and node_updates is not None
-                                    ):
-                                        logger.info(
-                                            f"Node execution update - {node_name}: {type(node_updates)}"
-                                        )
-                                        # Tracking functionality temporarily disabled
-                                        # try:
-                                        #     await track_node_from_stream(node_name, node_updates, config)
-                                        # except Exception as track_error:
-                                        #     logger.error(f"Stream tracking failed for {node_name}: {track_error}")
-
-                    elif isinstance(chunk, dict):
-                        # Fallback for direct dictionary format (backwards compatibility)
-                        logger.info(f"Direct chunk received: {list(chunk.keys())}")
-
-                        # Check for custom LLM chunks to stream back
-                        if "custom_llm_chunk" in chunk:
-                            text = chunk.get("custom_llm_chunk")
-                            if text:
-                                yield text
-
-                        # Handle node execution updates
-                        for key, value in chunk.items():
-                            if (
-                                key not in ["custom_llm_chunk", "__interrupt__"]
-                                and value is not None
-                            ):
-                                # Tracking functionality temporarily disabled
-                                # try:
-                                #     await track_node_from_stream(key, value, config)
-                                # except Exception as track_error:
-                                #     logger.error(f"Stream tracking failed for {key}: {track_error}")
-                                pass
-
-                    # Handle LangGraph interrupts (check both formats)
-                    interrupt_data = None
-                    if isinstance(chunk, tuple) and len(chunk) == 2:
-                        _, stream_data = chunk
-                        if isinstance(stream_data, dict):
-                            interrupt_data = stream_data.get("__interrupt__")
-                    elif isinstance(chunk, dict):
-                        interrupt_data = chunk.get("__interrupt__")
-
-                    if interrupt_data:
-                        interrupts = interrupt_data
-                        if interrupts:
-                            # For simplicity, handle the first interrupt
-                            interrupt_value = interrupts[0].value
-                            logger.info(f"Workflow interrupted: {interrupt_value}")
-                            return
+                    workflow_input["messages"] = current_messages
             else:
                 # True continuation - update messages in persisted state and resume
                 logger.info(f"Continuing existing conversation for thread {thread_id}")
@@ -199,192 +218,43 @@ async def _workflow_stream(
 
                 # Resume from interrupt point with user input
                 user_input = req.messages[-1].content if req.messages else ""
-                async for chunk in workflow.astream(
-                    Command(resume=user_input),
-                    config=config,
-                    stream_mode=["custom", "updates"],
-                ):
-                    # Handle both tuple format (stream_type, data) and direct dictionary format
-                    if isinstance(chunk, tuple) and len(chunk) == 2:
-                        stream_type, stream_data = chunk
-                        if stream_type == "custom" and isinstance(stream_data, dict):
-                            if "custom_llm_chunk" in stream_data:
-                                text = stream_data.get("custom_llm_chunk")
-                                if text:
-                                    yield text
-                    elif isinstance(chunk, dict) and "custom_llm_chunk" in chunk:
-                        text = chunk.get("custom_llm_chunk")
-                        if text:
-                            yield text
-
-                    # Handle node execution updates (new tracking capability)
-                    if isinstance(chunk, dict):
-                        for key, value in chunk.items():
-                            if (
-                                key not in ["custom_llm_chunk", "__interrupt__"]
-                                and value is not None
-                            ):
-                                # Track node execution automatically from stream (non-blocking)
-                                # Tracking functionality temporarily disabled
-                                # try:
-                                #     await track_node_from_stream(key, value, config)
-                                # except Exception as track_error:
-                                #     logger.error(f"Stream tracking failed for {key}: {track_error}")
-                                pass
-
-                    # Handle LangGraph interrupt for human-in-the-loop (resume section)
-                    interrupt_data = None
-                    if isinstance(chunk, tuple) and len(chunk) == 2:
-                        _, stream_data = chunk
-                        if isinstance(stream_data, dict):
-                            interrupt_data = stream_data.get("__interrupt__")
-                    elif isinstance(chunk, dict):
-                        interrupt_data = chunk.get("__interrupt__")
-
-                    if interrupt_data:
-                        interrupts = interrupt_data
-                        if interrupts:
-                            # For simplicity, handle the first interrupt
-                            interrupt_value = interrupts[0].value
-                            logger.info(f"Workflow interrupted: {interrupt_value}")
-                            return
+                workflow_input = Command(resume=user_input)
         else:
             # New conversation - create initial state and start fresh
             logger.info(f"Starting new conversation for thread {thread_id}")
-            state = create_workflow_initial_state(req.model)
+            workflow_input = create_workflow_initial_state(req.model)
             if req.messages:
-                state["messages"] = [msg.model_dump() for msg in req.messages]
-
-            # Start new workflow with initial state
-            async for chunk in workflow.astream(
-                state, config=config, stream_mode=["custom", "updates"]
-            ):
-                # Handle both tuple format (stream_type, data) and direct dictionary format
-                if isinstance(chunk, tuple) and len(chunk) == 2:
-                    stream_type, stream_data = chunk
-                    logger.info(
-                        f"Stream chunk received: {stream_type} -> {list(stream_data.keys()) if isinstance(stream_data, dict) else type(stream_data)}"
-                    )
-
-                    if stream_type == "custom":
-                        # Handle custom LLM chunks for user-facing streaming
-                        if (
-                            isinstance(stream_data, dict)
-                            and "custom_llm_chunk" in stream_data
-                        ):
-                            text = stream_data.get("custom_llm_chunk")
-                            if text:
-                                yield text
-
-                    elif stream_type == "updates":
-                        # Handle node execution updates for tracking
-                        if isinstance(stream_data, dict):
-                            for node_name, node_updates in stream_data.items():
-                                if (
-                                    node_name
-                                    not in ["custom_llm_chunk", "__interrupt__"]
-                                    and node_updates is not None
-                                ):
-                                    logger.info(
-                                        f"Node execution update - {node_name}: {type(node_updates)}"
-                                    )
-                                    # Tracking functionality temporarily disabled
-                                    # try:
-                                    #     await track_node_from_stream(node_name, node_updates, config)
-                                    # except Exception as track_error:
-                                    #     logger.error(f"Stream tracking failed for {node_name}: {track_error}")
-
-                elif isinstance(chunk, dict):
-                    # Fallback for direct dictionary format (backwards compatibility)
-                    logger.info(f"Direct dict chunk received: {list(chunk.keys())}")
-
-                    # Check for custom LLM chunks to stream back
-                    if "custom_llm_chunk" in chunk:
-                        text = chunk.get("custom_llm_chunk")
-                        if text:
-                            yield text
-
-                    # Handle node execution updates
-                    for key, value in chunk.items():
-                        if (
-                            key not in ["custom_llm_chunk", "__interrupt__"]
-                            and value is not None
-                        ):
-                            # Tracking functionality temporarily disabled
-                            # try:
-                            #     await track_node_from_stream(key, value, config)
-                            # except Exception as track_error:
-                            #     logger.error(f"Stream tracking failed for {key}: {track_error}")
-                            pass
-
-                # Handle LangGraph interrupts (check both formats)
-                interrupt_data = None
-                if isinstance(chunk, tuple) and len(chunk) == 2:
-                    _, stream_data = chunk
-                    if isinstance(stream_data, dict):
-                        interrupt_data = stream_data.get("__interrupt__")
-                elif isinstance(chunk, dict):
-                    interrupt_data = chunk.get("__interrupt__")
-
-                if interrupt_data:
-                    interrupts = interrupt_data
-                    if interrupts:
-                        # For simplicity, handle the first interrupt
-                        interrupt_value = interrupts[0].value
-                        logger.info(f"Workflow interrupted: {interrupt_value}")
-                        return
+                workflow_input["messages"] = current_messages
 
     except Exception as e:
         # Fallback to new conversation if state retrieval fails
         logger.warning(f"Could not retrieve existing state for thread {thread_id}: {e}")
-        state = create_workflow_initial_state(req.model)
+        workflow_input = create_workflow_initial_state(req.model)
         if req.messages:
-            state["messages"] = [msg.model_dump() for msg in req.messages]
-
-        # Start new workflow with initial state
-        async for chunk in workflow.astream(
-            state, config=config, stream_mode=["custom", "updates"]
-        ):
-            # Check for custom LLM chunks to stream back
-            if isinstance(chunk, dict) and "custom_llm_chunk" in chunk:
-                text = chunk.get("custom_llm_chunk")
-                if text:
-                    yield text
-
-            # Handle node execution updates (new tracking capability)
-            if isinstance(chunk, dict):
-                for key, value in chunk.items():
-                    if (
-                        key not in ["custom_llm_chunk", "__interrupt__"]
-                        and value is not None
-                    ):
-                        # Tracking functionality temporarily disabled
-                        # Track node execution automatically from stream (non-blocking)
-                        # try:
-                        #     await track_node_from_stream(key, value, config)
-                        # except Exception as track_error:
-                        #     logger.error(f"Stream tracking failed for {key}: {track_error}")
-                        pass
-
-            # Handle LangGraph interrupt for human-in-the-loop
-            if isinstance(chunk, dict) and "__interrupt__" in chunk:
-                interrupts = chunk.get("__interrupt__", [])
-                if interrupts:
-                    # For simplicity, handle the first interrupt
-                    interrupt_value = interrupts[0].value
-                    logger.info(f"Received interrupt with value: {interrupt_value}")
-                    if interrupt_value:
-                        logger.info(f"Yielding interrupt text: {interrupt_value}")
-                        yield interrupt_value
-                        # Stop streaming after an interrupt
-                        return
+            workflow_input["messages"] = current_messages
+
+    async with aclosing(_iter_stream(workflow, workflow_input, config)) as events:
+        async for kind, payload in events:
+            if kind == "text":
+                yield payload
+            elif kind == "update":
+                node_name, node_updates = payload
+                # Lazy %-formatting: this runs for every node update in the stream
+                logger.debug(
+                    "Node execution update - %s: %s", node_name, type(node_updates)
+                )
+            else:
+                logger.info(f"Workflow interrupted: {payload}")
+                return
 
 
+# Must stay an async generator passed straight to StreamingResponse: Starlette
+# iterates sync iterators in a threadpool, adding a thread hop per chunk
 async def _sse_generator(
     req: ChatCompletionRequest, request: Request
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[Union[str, bytes], None]:
     """Generate SSE messages for streaming chat completion, managing conversation state."""
-    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    completion_id = f"chatcmpl-{secrets.token_hex(16)}"
     created = int(time.time())
 
     # Use the new thread ID determination logic
@@ -398,20 +268,29 @@ async def _sse_generator(
         workflow = WorkflowRegistry.get_workflow(req.model, checkpointer)
         logger.info("Got Support Desk workflow, starting stream")
 
+        # Later chunks only differ by their text, so reuse a pre-encoded envelope
+        encode_content = create_content_chunk_encoder(
+            completion_id=completion_id,
+            model=req.model,
+            created=created,
+            thread_id=thread_id,  # Include thread_id in response
+        )
+
         first_chunk = True
         async for text in _workflow_stream(req, workflow, thread_id):
-            # Create SSE chunk
-            sse_chunk = create_sse_chunk(
-                completion_id=completion_id,
-                model=req.model,
-                created=created,
-                content=text,
-                role="assistant" if first_chunk else None,
-                thread_id=thread_id,  # Include thread_id in response
-            )
-
-            first_chunk = False
-            yield sse_chunk
+            if first_chunk:
+                # The first chunk also announces the assistant role
+                yield create_sse_chunk(
+                    completion_id=completion_id,
+                    model=req.model,
+                    created=created,
+                    content=text,
+                    role="assistant",
+                    thread_id=thread_id,
+                )
+                first_chunk = False
+            else:
+                yield encode_content(text)
 
         # Send final chunk if the graph hasn't been interrupted
         final_chunk = create_sse_chunk(
@@ -429,8 +308,7 @@ async def _sse_generator(
         yield create_done_chunk()
 
     except Exception as exc:
-        logger.error(f"Error in chat completion {completion_id}: {str(exc)}")
-        logger.error(f"Stack trace: {traceback.format_exc()}")
+        logger.exception(f"Error in chat completion {completion_id}: {str(exc)}")
 
         error_chunk = create_error_chunk(str(exc))
         yield error_chunk
@@ -439,9 +317,9 @@ async def _sse_generator(
 
 async def _create_non_streaming_response(
     req: ChatCompletionRequest, request: Request
-) -> ChatCompletionResponse:
+) -> Response:
     """Create a non-streaming chat completion response, managing conversation state."""
-    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    completion_id = f"chatcmpl-{secrets.token_hex(16)}"
     created = int(time.time())
 
     # Use the new thread ID determination logic
@@ -456,259 +334,95 @@ async def _create_non_streaming_response(
 
         config = {"configurable": {"thread_id": thread_id}}
 
+        # Serialise the request messages once, in a single pydantic-core call, and
+        # reuse them in every branch
+        current_messages = req.model_dump(include={"messages"})["messages"]
+
         # Check if there's existing state for this thread
         try:
-            existing_state = await workflow.aget_state(config)
-            if existing_state.values:
+            existing_values = await _get_thread_values(workflow, config)
+            if existing_values:
                 # Continuing conversation - update messages in persisted state and resume
                 logger.info(f"Continuing existing conversation for thread {thread_id}")
                 if req.messages:
                     # Update the persisted state with new user message
-                    update_state = {
-                        "messages": [msg.model_dump() for msg in req.messages]
-                    }
+                    update_state = {"messages": current_messages}
                     await workflow.aupdate_state(config, update_state)
 
                 # Resume from interrupt point with None input
-                full_response = ""
-                final_state = None
-                async for chunk in workflow.astream(
-                    None, config=config, stream_mode=["custom", "updates"]
-                ):
-                    # Handle both tuple format (stream_type, data) and direct dictionary format
-                    if isinstance(chunk, tuple) and len(chunk) == 2:
-                        stream_type, stream_data = chunk
-                        if stream_type == "custom" and isinstance(stream_data, dict):
-                            if "custom_llm_chunk" in stream_data:
-                                text = stream_data.get("custom_llm_chunk")
-                                if text:
-                                    full_response += text
-                        elif stream_type == "updates" and isinstance(stream_data, dict):
-                            # Handle node execution updates for tracking
-                            for node_name, node_updates in stream_data.items():
-                                if (
-                                    node_name
-                                    not in ["custom_llm_chunk", "__interrupt__"]
-                                    and node_updates is not None
-                                ):
-                                    # Tracking functionality temporarily disabled
-                                    # try:
-                                    #     await track_node_from_stream(node_name, node_updates, config)
-                                    # except Exception as track_error:
-                                    #     logger.error(f"Stream tracking failed for {node_name}: {track_error}")
-                                    pass
-                    elif isinstance(chunk, dict):
-                        # Fallback for direct dictionary format
-                        if "custom_llm_chunk" in chunk:
-                            text = chunk.get("custom_llm_chunk")
-                            if text:
-                                full_response += text
-
-                        # Handle node execution updates (background tracking)
-                        for key, value in chunk.items():
-                            if (
-                                key not in ["custom_llm_chunk", "__interrupt__"]
-                                and value is not None
-                            ):
-                                # Track node execution automatically from stream (non-blocking)
-                                # Tracking functionality temporarily disabled
-                                # try:
-                                #     await track_node_from_stream(key, value, config)
-                                # except Exception as track_error:
-                                #     logger.error(f"Stream tracking failed for {key}: {track_error}")
-                                pass
-
-                    # Update final state as we go
-                    state_data = None
-                    if isinstance(chunk, tuple) and len(chunk) == 2:
-                        _, stream_data = chunk
-                        if isinstance(stream_data, dict):
-                            state_data = stream_data
-                    elif isinstance(chunk, dict):
-                        state_data = chunk
-
-                    if state_data and any(
-                        key for key in state_data.keys() if not key.startswith("__")
-                    ):
-                        final_state = state_data
+                workflow_input = None
             else:
                 # New conversation - create initial state and start fresh
                 logger.info(f"Starting new conversation for thread {thread_id}")
-                state = create_workflow_initial_state(req.model)
+                workflow_input = create_workflow_initial_state(req.model)
                 if req.messages:
-                    state["messages"] = [msg.model_dump() for msg in req.messages]
-
-                # Start new workflow with initial state
-                full_response = ""
-                final_state = None
-                async for chunk in workflow.astream(
-                    state, config=config, stream_mode=["custom", "updates"]
-                ):
-                    # Handle both tuple format (stream_type, data) and direct dictionary format
-                    if isinstance(chunk, tuple) and len(chunk) == 2:
-                        stream_type, stream_data = chunk
-                        if stream_type == "custom" and isinstance(stream_data, dict):
-                            if "custom_llm_chunk" in stream_data:
-                                text = stream_data.get("custom_llm_chunk")
-                                if text:
-                                    full_response += text
-                        elif stream_type == "updates" and isinstance(stream_data, dict):
-                            # Handle node execution updates for tracking
-                            for node_name, node_updates in stream_data.items():
-                                if (
-                                    node_name
-                                    not in ["custom_llm_chunk", "__interrupt__"]
-                                    and node_updates is not None
-                                ):
-                                    # Tracking functionality temporarily disabled
-                                    # try:
-                                    #     await track_node_from_stream(node_name, node_updates, config)
-                                    # except Exception as track_error:
-                                    #     logger.error(f"Stream tracking failed for {node_name}: {track_error}")
-                                    pass
-                    elif isinstance(chunk, dict):
-                        # Fallback for direct dictionary format
-                        if "custom_llm_chunk" in chunk:
-                            text = chunk.get("custom_llm_chunk")
-                            if text:
-                                full_response += text
-
-                        # Handle node execution updates (background tracking)
-                        for key, value in chunk.items():
-                            if (
-                                key not in ["custom_llm_chunk", "__interrupt__"]
-                                and value is not None
-                            ):
-                                # Track node execution automatically from stream (non-blocking)
-                                # Tracking functionality temporarily disabled
-                                # try:
-                                #     await track_node_from_stream(key, value, config)
-                                # except Exception as track_error:
-                                #     logger.error(f"Stream tracking failed for {key}: {track_error}")
-                                pass
-
-                    # Update final state as we go
-                    state_data = None
-                    if isinstance(chunk, tuple) and len(chunk) == 2:
-                        _, stream_data = chunk
-                        if isinstance(stream_data, dict):
-                            state_data = stream_data
-                    elif isinstance(chunk, dict):
-                        state_data = chunk
-
-                    if state_data and any(
-                        key for key in state_data.keys() if not key.startswith("__")
-                    ):
-                        final_state = state_data
+                    workflow_input["messages"] = current_messages
 
         except Exception as e:
             # Fallback to new conversation if state retrieval fails
             logger.warning(
                 f"Could not retrieve existing state for thread {thread_id}: {e}"
             )
-            state = create_workflow_initial_state(req.model)
+            workflow_input = create_workflow_initial_state(req.model)
             if req.messages:
-                state["messages"] = [msg.model_dump() for msg in req.messages]
-
-            # Start new workflow with initial state
-            full_response = ""
-            final_state = None
-            async for chunk in workflow.astream(
-                state, config=config, stream_mode=["custom", "updates"]
-            ):
-                # Handle both tuple format (stream_type, data) and direct dictionary format
-                if isinstance(chunk, tuple) and len(chunk) == 2:
-                    stream_type, stream_data = chunk
-                    if stream_type == "custom" and isinstance(stream_data, dict):
-                        if "custom_llm_chunk" in stream_data:
-                            text = stream_data.get("custom_llm_chunk")
-                            if text:
-                                full_response += text
-                    elif stream_type == "updates" and isinstance(stream_data, dict):
-                        # Handle node execution updates for tracking
-                        for node_name, node_updates in stream_data.items():
-                            if (
-                                node_name not in ["custom_llm_chunk", "__interrupt__"]
-                                and node_updates is not None
-                            ):
-                                # Tracking functionality temporarily disabled
-                                # try:
-                                #     await track_node_from_stream(node_name, node_updates, config)
-                                # except Exception as track_error:
-                                #     logger.error(f"Stream tracking failed for {node_name}: {track_error}")
-                                pass
-                elif isinstance(chunk, dict):
-                    # Fallback for direct dictionary format
-                    if "custom_llm_chunk" in chunk:
-                        text = chunk.get("custom_llm_chunk")
-                        if text:
-                            full_response += text
-
-                    # Handle node execution updates (background tracking)
-                    for key, value in chunk.items():
-                        if (
-                            key not in ["custom_llm_chunk", "__interrupt__"]
-                            and value is not None
-                        ):
-                            # Track node execution automatically from stream (non-blocking)
-                            # Tracking functionality temporarily disabled
-                            # try:
-                            #     await track_node_from_stream(key, value, config)
-                            # except Exception as track_error:
-                            #     logger.error(f"Stream tracking failed for {key}: {track_error}")
-                            pass
-
-                # Update final state as we go
-                state_data = None
-                if isinstance(chunk, tuple) and len(chunk) == 2:
-                    _, stream_data = chunk
-                    if isinstance(stream_data, dict):
-                        state_data = stream_data
-                elif isinstance(chunk, dict):
-                    state_data = chunk
-
-                if state_data and any(
-                    key for key in state_data.keys() if not key.startswith("__")
-                ):
-                    final_state = state_data
-
-        return ChatCompletionResponse(
-            id=completion_id,
-            created=created,
-            model=req.model,
-            choices=[
-                ChatCompletionChoice(
-                    index=0,
-                    message=ChatMessage(role="assistant", content=full_response),
-                    finish_reason="stop"
-                    if not (final_state and final_state.get("__interrupt__"))
-                    else "interrupt",
-                )
+                workflow_input["messages"] = current_messages
+
+        response_parts = []
+        interrupted = False
+        async for kind, payload in _iter_stream(workflow, workflow_input, config):
+            if kind == "text":
+                response_parts.append(payload)
+            elif kind == "interrupt":
+                interrupted = True
+        full_response = "".join(response_parts)
+
+        # Character counts stand in for token usage (no tokenizer is wired in)
+        prompt_chars = sum(len(msg.content) for msg in req.messages)
+
+        # Built as a plain dict in the ChatCompletionResponse shape and serialised
+        # directly, skipping jsonable_encoder and response model validation
+        body = {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": req.model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {
+                        "role": "assistant",
+                        "content": full_response,
+                        "name": None,
+                    },
+                    "delta": None,
+                    "finish_reason": "interrupt" if interrupted else "stop",
+                }
             ],
-            usage={
-                "prompt_tokens": len(str(req.messages)),
+            "usage": {
+                "prompt_tokens": prompt_chars,
                 "completion_tokens": len(full_response),
-                "total_tokens": len(str(req.messages)) + len(full_response),
+                "total_tokens": prompt_chars + len(full_response),
             },
-            thread_id=thread_id,
-        )
+            "thread_id": thread_id,
+        }
+        return Response(content=orjson.dumps(body), media_type="application/json")
 
     except Exception as exc:
-        logger.error(f"Error in non-streaming completion {completion_id}: {str(exc)}")
-        logger.error(f"Stack trace: {traceback.format_exc()}")
+        logger.exception(
+            f"Error in non-streaming completion {completion_id}: {str(exc)}"
+        )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing request: {str(exc)}",
         )
 
 
-@v1_router.get("/models")
-async def list_models() -> ModelsResponse:
+@v1_router.get("/models", response_model=ModelsResponse)
+async def list_models() -> Response:
     """List available models for Open WebUI."""
     logger.info("Models list requested")
 
-    models = WorkflowRegistry.get_available_models()
-    return ModelsResponse(data=models)
+    return Response(content=_MODELS_RESPONSE_JSON, media_type="application/json")
 
 
 @v1_router.options("/models")
@@ -721,10 +435,14 @@ async def models_options():
 @v1_router.post("/chat/completions")
 async def chat_completions(chat_request: ChatCompletionRequest, request: Request):
     """Handle OpenAI-compatible chat completion requests."""
-    logger.info(
-        f"{GREY}Chat completion request - headers: {dict(request.headers)}{RESET}"
+    # Full headers and payload only at debug level, formatted lazily since the
+    # request repr walks every message
+    logger.debug(
+        "%sChat completion request - headers: %s%s", GREY, request.headers, RESET
+    )
+    logger.debug(
+        "%sChat completion request - chat_request: %s%s", GREY, chat_request, RESET
     )
-    logger.info(f"{GREY}Chat completion request - chat_request: {chat_request}{RESET}")
     logger.info(
         f"{GREY}Chat completion request - model: {chat_request.model}, stream: {chat_request.stream}{RESET}"
     )
@@ -738,6 +456,8 @@ async def chat_completions(chat_request: ChatCompletionRequest, request: Request
                 "Cache-Control": "no-cache",
                 "Connection": "keep-alive",
                 "Access-Control-Allow-Origin": "*",
+                # Stop reverse proxies (e.g. nginx) from buffering the token stream
+                "X-Accel-Buffering": "no",
             },
         )
     else:
@@ -745,11 +465,9 @@ async def chat_completions(chat_request: ChatCompletionRequest, request: Request
         return await _create_non_streaming_response(chat_request, request)
 
 
-# API information endpoint
-@v1_router.get("/")
-async def root():
-    """API information with HATEOAS links."""
-    return {
+# API information is static, so serialise it once at import
+_API_INFO_BYTES = orjson.dumps(
+    {
         "name": "Support Desk IT Support Agent API",
         "version": "1.0.0",
         "description": "OpenAI-compatible API for IT support chatbot using LangGraph workflows",
@@ -782,6 +500,14 @@ async def root():
             "response": ["application/json", "text/event-stream"],
         },
     }
+)
+
+
+# API information endpoint
+@v1_router.get("/")
+async def root():
+    """API information with HATEOAS links."""
+    return Response(content=_API_INFO_BYTES, media_type="application/json")
 
 
 # Include the v1 router in the main app
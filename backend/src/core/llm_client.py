@@ -1,10 +1,10 @@
 """LLM client for OpenRouter integration with streaming support."""
 
-import json
 import os
 import logging
 from typing import Dict, Any, Optional, Callable, List
 import aiohttp
+import orjson
 from .state_logger import GREY, RESET
 
 logger = logging.getLogger(__name__)
@@ -23,6 +23,27 @@ class OpenRouterClient:
 
         self.base_url = "https://openrouter.ai/api/v1"
 
+        # Shared HTTP session, created on first use inside the running event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it if needed.
+
+        Reusing one session keeps connections to OpenRouter alive between
+        calls, so each LLM request skips the TCP and TLS handshake.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(ttl_dns_cache=300, keepalive_timeout=75)
+            )
+        return self._session
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP session and its pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
     async def chat_completion(
         self,
         messages: List[Dict[str, str]],
@@ -81,112 +102,104 @@ class OpenRouterClient:
         elif response_format:
             payload["response_format"] = response_format
 
-        accumulated_content = ""
-        tool_calls = []
+        content_parts = []
+        # Per tool call: id plus name/argument fragments, joined after the stream
+        tool_call_parts = []
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/chat/completions", headers=headers, json=payload
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(
-                            f"OpenRouter API error: {response.status} - {error_text}"
-                        )
-                        raise Exception(f"OpenRouter API error: {response.status}")
-
-                    # Handle non-streaming responses (tool calls)
-                    if not use_streaming:
-                        response_data = await response.json()
-                        return response_data.get("choices", [{}])[0].get("message", {})
-
-                    # Handle streaming responses (structured outputs)
-                    buffer = ""
-                    async for chunk in response.content:
-                        if not chunk:
-                            continue
-
-                        chunk_str = chunk.decode("utf-8")
-                        buffer += chunk_str
-
-                        # Process complete lines
-                        while "\n" in buffer:
-                            line_end = buffer.find("\n")
-                            line = buffer[:line_end].strip()
-                            buffer = buffer[line_end + 1 :]
-
-                            if not line or line.startswith(":"):
-                                continue
-
-                            if line.startswith("data: "):
-                                data = line[6:]
-                                if data == "[DONE]":
-                                    break
-
-                                try:
-                                    data_obj = json.loads(data)
-                                    delta = data_obj.get("choices", [{}])[0].get(
-                                        "delta", {}
+            session = self._get_session()
+            async with session.post(
+                f"{self.base_url}/chat/completions",
+                headers=headers,
+                data=orjson.dumps(payload),
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    logger.error(
+                        f"OpenRouter API error: {response.status} - {error_text}"
+                    )
+                    raise Exception(f"OpenRouter API error: {response.status}")
+
+                # Handle non-streaming responses (tool calls)
+                if not use_streaming:
+                    response_data = orjson.loads(await response.read())
+                    return response_data.get("choices", [{}])[0].get("message", {})
+
+                # Handle streaming responses (structured outputs). The stream
+                # reader yields complete lines, so parse each one as bytes
+                async for raw_line in response.content:
+                    line = raw_line.strip()
+
+                    if not line.startswith(b"data: "):
+                        # Skip blank separators and ":" keep-alive comments
+                        continue
+
+                    data = line[6:]
+                    if data == b"[DONE]":
+                        # Keep reading to EOF rather than breaking out, so the
+                        # connection is released cleanly for keep-alive reuse
+                        continue
+
+                    try:
+                        data_obj = orjson.loads(data)
+                        delta = data_obj.get("choices", [{}])[0].get("delta", {})
+
+                        # Handle regular content
+                        if content := delta.get("content"):
+                            content_parts.append(content)
+                            if stream_callback:
+                                stream_callback(content)
+
+                        # Handle tool calls
+                        if tool_calls_delta := delta.get("tool_calls"):
+                            for tool_call_delta in tool_calls_delta:
+                                index = tool_call_delta.get("index", 0)
+
+                                # Grow the list only when a new tool call index appears
+                                missing = index + 1 - len(tool_call_parts)
+                                if missing > 0:
+                                    tool_call_parts.extend(
+                                        {"id": "", "name": [], "arguments": []}
+                                        for _ in range(missing)
                                     )
+                                parts = tool_call_parts[index]
+
+                                # Update the tool call at this index
+                                if "id" in tool_call_delta:
+                                    parts["id"] = tool_call_delta["id"]
+
+                                if func_delta := tool_call_delta.get("function"):
+                                    if name := func_delta.get("name"):
+                                        parts["name"].append(name)
+                                    if arguments := func_delta.get("arguments"):
+                                        parts["arguments"].append(arguments)
 
-                                    # Handle regular content
-                                    if content := delta.get("content"):
-                                        accumulated_content += content
-                                        if stream_callback:
-                                            stream_callback(content)
-
-                                    # Handle tool calls
-                                    if tool_calls_delta := delta.get("tool_calls"):
-                                        for tool_call_delta in tool_calls_delta:
-                                            index = tool_call_delta.get("index", 0)
-
-                                            # Ensure we have enough tool calls in our list
-                                            while len(tool_calls) <= index:
-                                                tool_calls.append(
-                                                    {
-                                                        "id": "",
-                                                        "type": "function",
-                                                        "function": {
-                                                            "name": "",
-                                                            "arguments": "",
-                                                        },
-                                                    }
-                                                )
-
-                                            # Update the tool call at this index
-                                            if "id" in tool_call_delta:
-                                                tool_calls[index]["id"] = (
-                                                    tool_call_delta["id"]
-                                                )
-
-                                            if "function" in tool_call_delta:
-                                                func_delta = tool_call_delta["function"]
-                                                if "name" in func_delta:
-                                                    tool_calls[index]["function"][
-                                                        "name"
-                                                    ] += func_delta["name"]
-                                                if "arguments" in func_delta:
-                                                    tool_calls[index]["function"][
-                                                        "arguments"
-                                                    ] += func_delta["arguments"]
-
-                                except json.JSONDecodeError:
-                                    logger.warning(f"Failed to decode JSON: {data}")
-                                    continue
-                                except Exception as e:
-                                    logger.error(f"Error processing chunk: {e}")
-                                    continue
+                    except orjson.JSONDecodeError:
+                        logger.warning(f"Failed to decode JSON: {data!r}")
+                        continue
+                    except Exception as e:
+                        logger.error(f"Error processing chunk: {e}")
+                        continue
 
         except Exception as e:
             logger.error(f"Error in chat completion: {e}")
             raise
 
-        response = {"role": "assistant", "content": accumulated_content}
+        response = {"role": "assistant", "content": "".join(content_parts)}
 
         # Add tool calls if any were made
-        if tool_calls:
-            response["tool_calls"] = tool_calls
+        if tool_call_parts:
+            response["tool_calls"] = [
+                {
+                    "id": parts["id"],
+                    "type": "function",
+                    "function": {
+                        "name": "".join(parts["name"]),
+                        "arguments": "".join(parts["arguments"]),
+                    },
+                }
+                for parts in tool_call_parts
+            ]
 
         return response
 
@@ -1,13 +1,26 @@
 """
 Logging configuration for the application.
 This module sets up dual logging to console and file.
+
+Records are handed to a background listener thread through a queue, so the
+console and file writes never block the event loop.
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 from datetime import datetime
 
+# Skip per-record thread/process introspection; the log format doesn't use it
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+# Minimum level for all handlers, from LOG_LEVEL (same default as main.py)
+log_level = getattr(logging, os.getenv("LOG_LEVEL", "info").upper(), logging.INFO)
+
 # Create logs directory if it doesn't exist
 os.makedirs("logs", exist_ok=True)
 
@@ -20,7 +33,7 @@ formatter = logging.Formatter(log_format)
 
 # Console handler (stdout)
 console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.DEBUG)
+console_handler.setLevel(log_level)
 console_handler.setFormatter(formatter)
 
 # File handler
@@ -29,20 +42,39 @@ file_handler = logging.handlers.RotatingFileHandler(
     maxBytes=10 * 1024 * 1024,  # 10MB
     backupCount=5,
 )
-file_handler.setLevel(logging.DEBUG)
+file_handler.setLevel(log_level)
 file_handler.setFormatter(formatter)
 
+# Root logger only enqueues records; the listener thread does the actual I/O
+log_queue = queue.SimpleQueue()
+queue_listener = logging.handlers.QueueListener(
+    log_queue, console_handler, file_handler, respect_handler_level=True
+)
+queue_listener.start()
+atexit.register(queue_listener.stop)
+
 # Configure root logger
 logging.basicConfig(
-    level=logging.DEBUG,
-    format=log_format,
-    handlers=[console_handler, file_handler],
+    level=log_level,
+    # Queued records keep the bare message; the listener's handlers format them
+    format="%(message)s",
+    handlers=[logging.handlers.QueueHandler(log_queue)],
     force=True,
 )
 
-# Suppress noisy loggers
-logging.getLogger("watchfiles.main").setLevel(logging.WARNING)
-logging.getLogger("watchfiles").setLevel(logging.WARNING)
+# Suppress noisy loggers that emit high-frequency DEBUG/INFO records
+NOISY_LOGGERS = (
+    "watchfiles",
+    "watchfiles.main",
+    "aiohttp.access",
+    "aiohttp.client",
+    "asyncio",
+    "httpx",
+    "httpcore",
+    "urllib3.connectionpool",
+)
+for noisy_logger in NOISY_LOGGERS:
+    logging.getLogger(noisy_logger).setLevel(logging.WARNING)
 
 # Log startup message
 logger = logging.getLogger(__name__)
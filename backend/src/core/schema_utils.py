@@ -1,8 +1,9 @@
 """Schema conversion utilities for OpenRouter structured outputs."""
 
-import json
+from functools import lru_cache
 from typing import Dict, Any, Type
 from pydantic import BaseModel
+import orjson
 
 
 def pydantic_to_json_schema(
@@ -22,15 +23,15 @@ def pydantic_to_json_schema(
     json_schema = model_class.model_json_schema()
 
     # Remove the title if it exists (OpenRouter prefers name)
-    if "title" in json_schema:
-        del json_schema["title"]
+    json_schema.pop("title", None)
 
     # Ensure strict mode and no additional properties
     json_schema["additionalProperties"] = False
 
     # OpenRouter requires ALL properties to be in required array for structured outputs
-    if "properties" in json_schema:
-        json_schema["required"] = list(json_schema["properties"].keys())
+    properties = json_schema.get("properties")
+    if properties:
+        json_schema["required"] = list(properties)
 
     return {
         "type": "json_schema",
@@ -38,12 +39,16 @@ def pydantic_to_json_schema(
     }
 
 
+@lru_cache(maxsize=None)
 def pydantic_to_openai_tool(
     model_class: Type[BaseModel], tool_name: str
 ) -> Dict[str, Any]:
     """
     Convert a Pydantic model to OpenAI tool format (for non-streaming tool calls).
 
+    Results are cached per (model_class, tool_name), so the returned dict is
+    shared between callers and must be treated as read-only.
+
     Args:
         model_class: Pydantic model class
         tool_name: Name for the tool
@@ -78,46 +83,26 @@ def extract_tool_call_args(
     Raises:
         ValueError: If tool calls are missing, malformed, or arguments are invalid JSON
     """
-    # Check if response exists
-    if not response:
-        raise ValueError("Response is None or empty")
-
-    # Check if tool_calls exist
-    tool_calls = response.get("tool_calls")
-    if not tool_calls:
-        raise ValueError("No tool calls found in response")
-
-    if not isinstance(tool_calls, list) or len(tool_calls) == 0:
-        raise ValueError("Tool calls is not a valid list or is empty")
-
-    # Get the first tool call
-    tool_call = tool_calls[0]
-
-    # Validate tool call structure
-    if not isinstance(tool_call, dict):
-        raise ValueError("Tool call is not a dictionary")
-
-    function = tool_call.get("function")
-    if not function:
-        raise ValueError("No function found in tool call")
+    # Happy path is straight-line; any structural problem surfaces as a lookup error
+    try:
+        function = response["tool_calls"][0]["function"]
+        actual_name = function.get("name")
+        arguments_str = function.get("arguments")
+    except (KeyError, IndexError, TypeError, AttributeError) as e:
+        raise ValueError(f"Malformed or missing tool call in response: {e!r}") from e
 
     # Validate expected tool name if provided
-    if expected_tool_name:
-        actual_name = function.get("name")
-        if actual_name != expected_tool_name:
-            raise ValueError(
-                f"Expected tool '{expected_tool_name}', got '{actual_name}'"
-            )
+    if expected_tool_name and actual_name != expected_tool_name:
+        raise ValueError(f"Expected tool '{expected_tool_name}', got '{actual_name}'")
 
-    # Extract and parse arguments
-    arguments_str = function.get("arguments")
     if not arguments_str:
         raise ValueError("No arguments found in function call")
 
     try:
-        arguments = json.loads(arguments_str)
-        if not isinstance(arguments, dict):
-            raise ValueError("Arguments are not a valid dictionary")
-        return arguments
-    except json.JSONDecodeError as e:
+        arguments = orjson.loads(arguments_str)
+    except orjson.JSONDecodeError as e:
         raise ValueError(f"Failed to parse arguments JSON: {e}")
+
+    if type(arguments) is not dict:
+        raise ValueError("Arguments are not a valid dictionary")
+    return arguments
@@ -14,6 +14,9 @@ END_RED = "\033[38;5;203m"  # Warm coral red for ending
 GREY = "\033[38;5;240m"  # Subtle grey for infrastructure logs
 RESET = "\033[0m"
 
+# Sentinel for state keys absent before a node ran (None is a valid value)
+_MISSING = object()
+
 
 def format_value_concisely(value: Any, max_str_len: int = 40) -> str:
     """
@@ -76,6 +79,10 @@ def log_node_start(
         reads: List of state fields this node will read (supports dot notation)
         state: Optional current state to show values of read fields
     """
+    # Skip resolving and formatting the read values if the line would be dropped
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
     if state is not None:
         reads_with_values = []
         for field in reads:
@@ -108,33 +115,36 @@ def log_node_complete(
         state_before: State before node execution
         state_after: State after node execution
     """
+    # Nothing below is needed if the summary line would be discarded
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
     writes = []
 
     # Check top-level changes
-    for key in state_after.keys():
-        if key not in state_before:
+    for key, value in state_after.items():
+        old_value = state_before.get(key, _MISSING)
+
+        # Untouched fields usually keep the same object, so skip the deep compare
+        if old_value is value:
+            continue
+
+        if old_value is _MISSING:
             # New key added
-            value = state_after[key]
-            concise_value = format_value_concisely(value)
-            writes.append(f"{key}: {concise_value}")
-        elif state_before[key] != state_after[key]:
-            # Existing key modified
-            value = state_after[key]
-
-            # For nested dictionaries, try to show what specifically changed
-            if isinstance(value, dict) and isinstance(state_before[key], dict):
-                # Check nested changes
-                for nested_key in value.keys():
-                    if (
-                        nested_key not in state_before[key]
-                        or state_before[key][nested_key] != value[nested_key]
+            writes.append(f"{key}: {format_value_concisely(value)}")
+        elif old_value != value:
+            # Existing key modified - for nested dictionaries, try to show what
+            # specifically changed
+            if isinstance(value, dict) and isinstance(old_value, dict):
+                for nested_key, nested_value in value.items():
+                    old_nested = old_value.get(nested_key, _MISSING)
+                    if old_nested is not nested_value and (
+                        old_nested is _MISSING or old_nested != nested_value
                     ):
-                        nested_value = value[nested_key]
                         concise_value = format_value_concisely(nested_value)
                         writes.append(f"{key}.{nested_key}: {concise_value}")
             else:
-                concise_value = format_value_concisely(value)
-                writes.append(f"{key}: {concise_value}")
+                writes.append(f"{key}: {format_value_concisely(value)}")
 
     writes_str = ", ".join(writes) if writes else "none"
     logger.info(f"{END_RED}{node_name.upper()} → {{{writes_str}}}{RESET}")
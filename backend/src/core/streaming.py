@@ -1,8 +1,10 @@
 """Server-Sent Events (SSE) streaming utilities for Open WebUI compatibility."""
 
-import json
 import logging
-from typing import Dict, Any
+from typing import Any, Callable, Dict
+
+import orjson
+
 from .models import ChatMessage, SystemMessage, HumanMessage, AIMessage
 
 logger = logging.getLogger(__name__)
@@ -10,7 +12,7 @@ logger = logging.getLogger(__name__)
 
 def _sse(data: Dict[str, Any]) -> str:
     """Format data as Server-Sent Event."""
-    return f"data: {json.dumps(data)}\n\n"
+    return f"data: {orjson.dumps(data).decode()}\n\n"
 
 
 def _extract_text(message) -> str:
@@ -71,6 +73,41 @@ def create_sse_chunk(
     return _sse(payload)
 
 
+def create_content_chunk_encoder(
+    completion_id: str,
+    model: str,
+    created: int,
+    thread_id: str = None,
+) -> Callable[[str], bytes]:
+    """
+    Build an encoder for the content-only SSE chunks of one completion.
+
+    The envelope (id, model, created, thread_id) is fixed for a completion, so it
+    is serialised once and each token only has its own text JSON-encoded.
+
+    Returns:
+        Function mapping token text to an SSE chunk equivalent to
+        ``create_sse_chunk(completion_id, model, created, content=text, ...)``
+    """
+    envelope = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": created,
+        "model": model,
+    }
+
+    if thread_id:
+        envelope["thread_id"] = thread_id
+
+    prefix = b'data: {"choices":[{"index":0,"delta":{"content":'
+    suffix = b'},"finish_reason":null}],' + orjson.dumps(envelope)[1:] + b"\n\n"
+
+    def encode(content: str) -> bytes:
+        return prefix + orjson.dumps(content) + suffix
+
+    return encode
+
+
 def create_done_chunk() -> str:
     """Create the final [DONE] SSE chunk."""
     return "data: [DONE]\n\n"
@@ -6,7 +6,6 @@ after the preview node has generated and streamed the diff/preview.
 """
 
 import logging
-from copy import deepcopy
 
 from ..state import FSAgentState
 from src.core.state_logger import log_node_start, log_node_complete
@@ -14,6 +13,25 @@ from langgraph.types import interrupt
 
 logger = logging.getLogger(__name__)
 
+# Accepted replies to an approval request
+APPROVE_RESPONSES = frozenset({"yes", "y", "proceed", "ok", "approve", "confirm"})
+REJECT_RESPONSES = frozenset({"no", "n", "cancel", "abort", "reject", "deny"})
+
+
+def _snapshot_for_log(state: FSAgentState) -> dict:
+    """
+    Snapshot state for log_node_complete without a full deepcopy.
+
+    Only the subtrees this node mutates (the approval dict and the messages list)
+    are copied; every other field is shared, which log_node_complete then skips
+    with an identity check.
+    """
+    snapshot = dict(state)
+    snapshot["approval"] = dict(state["approval"])
+    if "messages" in state:
+        snapshot["messages"] = list(state["messages"])
+    return snapshot
+
 
 async def human_approve_node(state: FSAgentState) -> FSAgentState:
     """
@@ -28,7 +46,7 @@ async def human_approve_node(state: FSAgentState) -> FSAgentState:
     Returns:
         Updated state with user's approval decision
     """
-    state_before = deepcopy(state)
+    state_before = _snapshot_for_log(state)
 
     # Log what this node will read from state
     log_node_start(
@@ -60,11 +78,11 @@ async def human_approve_node(state: FSAgentState) -> FSAgentState:
     if user_response:
         response_str = str(user_response).strip().lower()
 
-        if response_str in ["yes", "y", "proceed", "ok", "approve", "confirm"]:
+        if response_str in APPROVE_RESPONSES:
             state["approval"]["approval_granted"] = True
             decision = "approved"
             logger.info(f"→ user approved {action_type} on {file_path}")
-        elif response_str in ["no", "n", "cancel", "abort", "reject", "deny"]:
+        elif response_str in REJECT_RESPONSES:
             state["approval"]["approval_granted"] = False
             decision = "rejected"
             logger.info(f"→ user rejected {action_type} on {file_path}")
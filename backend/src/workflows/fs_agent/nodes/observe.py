@@ -6,6 +6,7 @@ On first interaction, it determines if the session should be read-only or allow
 """
 
 import logging
+import re
 from copy import deepcopy
 
 from ..state import FSAgentState
@@ -15,6 +16,11 @@ from langgraph.config import get_stream_writer
 
 logger = logging.getLogger(__name__)
 
+# Simple heuristic: write-related keywords, matched in one pass over the message
+WRITE_KEYWORDS_PATTERN = re.compile(
+    "create|write|build|make|generate|modify|delete|save"
+)
+
 
 async def observe_node(state: FSAgentState) -> FSAgentState:
     """
@@ -45,17 +51,7 @@ async def observe_node(state: FSAgentState) -> FSAgentState:
         if messages:
             user_message = messages[-1].get("content", "").lower()
             # Simple heuristic: look for write-related keywords
-            write_keywords = [
-                "create",
-                "write",
-                "build",
-                "make",
-                "generate",
-                "modify",
-                "delete",
-                "save",
-            ]
-            needs_write = any(keyword in user_message for keyword in write_keywords)
+            needs_write = WRITE_KEYWORDS_PATTERN.search(user_message) is not None
 
             state["session"]["is_read_only"] = not needs_write
             state["session"]["is_first_interaction"] = False
@@ -5,6 +5,7 @@ the IT Support Desk workflow. It extends company-wide definitions with
 workflow-specific categorizations and rules.
 """
 
+import re
 from typing import Literal
 from .config.company_config import COMPANY_SUPPORT_TEAMS
 from .utils import load_ontologies, get_sla_commitment as ontology_get_sla_commitment
@@ -70,8 +71,8 @@ ISSUE_CATEGORIES = {
     "other": {"keywords": [], "typical_team": "L1", "escalation_triggers": []},
 }
 
-# Extend company teams with workflow-specific definitions
-SUPPORT_TEAMS = {**COMPANY_SUPPORT_TEAMS}
+# Workflow support teams share the read-only company definitions
+SUPPORT_TEAMS = COMPANY_SUPPORT_TEAMS
 
 # Workflow-specific routing rules
 ROUTING_RULES = {
@@ -90,6 +91,14 @@ ROUTING_RULES = {
     },
 }
 
+# Routing keywords compiled once so each check is a single pass over the conversation
+_AUTO_ESCALATE_PATTERN = re.compile(
+    "|".join(re.escape(k.lower()) for k in ROUTING_RULES["auto_escalate_keywords"])
+)
+_SPECIALIST_TRIGGER_PATTERN = re.compile(
+    "|".join(re.escape(t.lower()) for t in ROUTING_RULES["specialist_triggers"])
+)
+
 # Knowledge base categories for this workflow
 KB_CATEGORIES = [
     "getting_started",
@@ -102,6 +111,12 @@ KB_CATEGORIES = [
 # Load priority ontology for SLA calculations
 _, priorities_ontology, _ = load_ontologies()
 
+# SLA mapping for quick lookup, computed once from the priority ontology
+SLA_COMMITMENTS = {
+    f"P{i}": ontology_get_sla_commitment(priorities_ontology, f"P{i}")
+    for i in range(1, 5)
+}
+
 
 # Workflow-specific SLA commitments (using priority ontology)
 def get_sla_commitment(priority: str) -> tuple[str, int]:
@@ -114,11 +129,11 @@ def get_sla_commitment(priority: str) -> tuple[str, int]:
     Returns:
         Tuple of (SLA description, hours)
     """
-    return ontology_get_sla_commitment(priorities_ontology, priority)
-
-
-# SLA mapping for quick lookup
-SLA_COMMITMENTS = {f"P{i}": get_sla_commitment(f"P{i}") for i in range(1, 5)}
+    commitment = SLA_COMMITMENTS.get(priority)
+    if commitment is None:
+        # Let the ontology normalise unexpected values (e.g. "p2", None)
+        commitment = ontology_get_sla_commitment(priorities_ontology, priority)
+    return commitment
 
 # Build routing table with ontology-based time calculations
 def _build_routing_table() -> dict:
@@ -182,28 +197,27 @@ def get_routing_decision(
     # Check for auto-escalation keywords
     if conversation_text:
         conversation_lower = conversation_text.lower()
-        for keyword in ROUTING_RULES["auto_escalate_keywords"]:
-            if keyword.lower() in conversation_lower:
-                return {
-                    "support_team": "escalation",
-                    "estimated_resolution_time": "30 minutes",
-                }
+        if _AUTO_ESCALATE_PATTERN.search(conversation_lower):
+            return {
+                "support_team": "escalation",
+                "estimated_resolution_time": "30 minutes",
+            }
 
         # Check for specialist triggers
-        for trigger, specialist in ROUTING_RULES["specialist_triggers"].items():
-            if trigger.lower() in conversation_lower:
-                # Use consistent ontology-based time for P2 (default for specialist routing)
-                sla_text, _ = get_sla_commitment("P2")
-                return {
-                    "support_team": "specialist",
-                    "estimated_resolution_time": sla_text,
-                }
+        if _SPECIALIST_TRIGGER_PATTERN.search(conversation_lower):
+            # Use consistent ontology-based time for P2 (default for specialist routing)
+            sla_text, _ = get_sla_commitment("P2")
+            return {
+                "support_team": "specialist",
+                "estimated_resolution_time": sla_text,
+            }
 
     # Use routing table for standard routing
     routing_key = (issue_category or "other", issue_priority or "P2")
+    routing = ROUTING_TABLE.get(routing_key)
 
     # Default fallback if key not found - use ontology-based time
-    if routing_key not in ROUTING_TABLE:
+    if routing is None:
         fallback_priority = issue_priority or "P2"
         sla_text, _ = get_sla_commitment(fallback_priority)
         default_routing = {
@@ -212,7 +226,7 @@ def get_routing_decision(
         }
         return default_routing
 
-    return ROUTING_TABLE.get(routing_key)
+    return routing
 
 
 # Required information categories for ticket creation
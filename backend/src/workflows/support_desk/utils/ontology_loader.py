@@ -2,15 +2,21 @@
 Utility for loading Support Desk ontologies from JSON files.
 """
 
-import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Tuple
 
+import orjson
 
+
+@lru_cache(maxsize=1)
 def load_ontologies() -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
     """
     Load all ontologies from JSON files.
 
+    The files are read and parsed once per process; subsequent calls return
+    the same dictionaries, so callers must treat them as read-only.
+
     Returns:
         Tuple of (categories, priorities, required_info) dictionaries
     """
@@ -18,16 +24,17 @@ def load_ontologies() -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
     ontologies_path = base_path / "ontologies"
 
     # Load categories
-    with open(ontologies_path / "categories_ontology.json", "r") as f:
-        categories = json.load(f)
+    categories = orjson.loads(
+        (ontologies_path / "categories_ontology.json").read_bytes()
+    )
 
     # Load priorities
-    with open(ontologies_path / "priority_ontology.json", "r") as f:
-        priorities = json.load(f)
+    priorities = orjson.loads((ontologies_path / "priority_ontology.json").read_bytes())
 
     # Load required information
-    with open(ontologies_path / "required_information_ontology.json", "r") as f:
-        required_info = json.load(f)
+    required_info = orjson.loads(
+        (ontologies_path / "required_information_ontology.json").read_bytes()
+    )
 
     return categories, priorities, required_info
 
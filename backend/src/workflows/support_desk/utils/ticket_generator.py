@@ -6,27 +6,32 @@ Generates deterministic ticket data based on issue information.
 
 import hashlib
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Mapping, Optional
 
 from ..business_context import get_sla_commitment, SUPPORT_TEAMS
 from ..config.company_config import COMPANY_INFO
 
 
-def generate_ticket_id(issue_info: Dict[str, Any]) -> str:
+def generate_ticket_id(
+    issue_info: Dict[str, Any], now: Optional[datetime] = None
+) -> str:
     """
     Generate a deterministic ticket ID based on issue info and timestamp.
 
     Args:
         issue_info: Dictionary containing issue information
+        now: Timestamp to base the ID on (defaults to the current time)
 
     Returns:
         Ticket ID in format DESK-YYYYMMDD-NNNN
     """
+    now = now or datetime.now()
+
     # Use current date for the ID
-    date_str = datetime.now().strftime("%Y%m%d")
+    date_str = now.strftime("%Y%m%d")
 
     # Create a hash from issue info for uniqueness
-    info_str = f"{issue_info.get('category', '')}{issue_info.get('priority', '')}{datetime.now().isoformat()}"
+    info_str = f"{issue_info.get('category', '')}{issue_info.get('priority', '')}{now.isoformat()}"
     hash_obj = hashlib.md5(info_str.encode())
     hash_num = int(hash_obj.hexdigest()[:8], 16) % 10000
 
@@ -36,7 +41,7 @@ def generate_ticket_id(issue_info: Dict[str, Any]) -> str:
 # SLA commitment function imported from business_context
 
 
-def get_team_contact_info(team: str) -> Dict[str, str]:
+def get_team_contact_info(team: str) -> Mapping[str, str]:
     """
     Get contact information based on assigned team from business context.
 
@@ -71,9 +76,11 @@ def get_next_steps(priority: str, category: str) -> str:
     """
     if priority.upper() == "P1":
         return "Your high-priority ticket has been escalated. A specialist will contact you within 30 minutes. Please keep your phone available."
-    elif category.lower() == "hardware":
+
+    category = category.lower()
+    if category == "hardware":
         return "A hardware technician will review your ticket and may schedule an on-site visit if needed. You'll receive an update within the SLA timeframe."
-    elif category.lower() == "access":
+    elif category == "access":
         return "Your access request will be reviewed by the security team. You may receive additional verification requests via email."
     else:
         return "Your ticket has been assigned to the appropriate team. You'll receive updates via email as progress is made. Check the support portal for real-time status."
@@ -95,15 +102,18 @@ def generate_ticket_data(state: Dict[str, Any]) -> Dict[str, Any]:
     priority = classification.get("issue_priority", "P2")
     team = classification.get("assigned_team", "L1")
 
+    # Capture the clock once so the ID, creation and resolution times agree
+    now = datetime.now()
+
     # Generate ticket ID
-    ticket_id = generate_ticket_id({"category": category, "priority": priority})
+    ticket_id = generate_ticket_id({"category": category, "priority": priority}, now)
 
     # Get SLA and contact info
     sla_text, sla_hours = get_sla_commitment(priority)
     contact_info = get_team_contact_info(team)
 
     # Calculate estimated resolution
-    resolution_time = datetime.now() + timedelta(hours=sla_hours)
+    resolution_time = now + timedelta(hours=sla_hours)
 
     # Get issue summary from messages - find the most substantive user message
     issue_summary = ""
@@ -136,6 +146,6 @@ def generate_ticket_data(state: Dict[str, Any]) -> Dict[str, Any]:
         "support_email": contact_info.get("email", "support@company.com"),
         "support_phone": contact_info.get("phone", "1-800-SUPPORT"),
         "ticket_portal": contact_info.get("portal", "https://support.company.com"),
-        "created_timestamp": datetime.now().strftime("%B %d, %Y at %I:%M %p"),
+        "created_timestamp": now.strftime("%B %d, %Y at %I:%M %p"),
         "estimated_resolution": resolution_time.strftime("%B %d, %Y at %I:%M %p"),
     }